@@ -318,12 +318,24 @@ def check_all(
     help="Include descriptions, examples, etc. in the dumped output",
     default=False,
 )
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, resolve_path=True, path_type=Path),
+    help="Directory to cache extracted module information in, reused across runs with the same ansible-doc version (default: not cached)",
+    default=None,
+)
 def prepare_module_kb(
-    output_path: Path, ansible_doc_path: Path, full: bool = False
+    output_path: Path,
+    ansible_doc_path: Path,
+    full: bool = False,
+    cache_dir: Path | None = None,
 ) -> None:
     """Prepare the knowledge base of modules and write it to OUTPUT_PATH."""
 
-    kb = ModuleKnowledgeBase.init_from_ansible_docs(str(ansible_doc_path))
+    if cache_dir is not None:
+        kb = ModuleKnowledgeBase.init_cached(cache_dir, str(ansible_doc_path))
+    else:
+        kb = ModuleKnowledgeBase.init_from_ansible_docs(str(ansible_doc_path))
     output_path.parent.mkdir(exist_ok=True, parents=True)
     kb.dump_to_file(output_path, slim=not full)
 
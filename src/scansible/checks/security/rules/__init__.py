@@ -10,14 +10,17 @@ from .missing_integrity_check import MissingIntegrityCheckRule
 from .unrestricted_ip_address import UnrestrictedIPAddressRule
 from .weak_crypto import WeakCryptoAlgorithmRule
 
+# Rules are stateless, so the same instances can be shared by every run.
+_ALL_RULES: tuple[Rule, ...] = (
+    AdminByDefaultRule(),
+    EmptyPasswordRule(),
+    HardcodedSecretRule(),
+    HTTPWithoutSSLTLSRule(),
+    MissingIntegrityCheckRule(),
+    UnrestrictedIPAddressRule(),
+    WeakCryptoAlgorithmRule(),
+)
+
 
 def get_all_rules() -> list[Rule]:
-    return [
-        AdminByDefaultRule(),
-        EmptyPasswordRule(),
-        HardcodedSecretRule(),
-        HTTPWithoutSSLTLSRule(),
-        MissingIntegrityCheckRule(),
-        UnrestrictedIPAddressRule(),
-        WeakCryptoAlgorithmRule(),
-    ]
+    return list(_ALL_RULES)
@@ -4,6 +4,7 @@ from typing import ClassVar, NamedTuple
 
 import abc
 from collections.abc import Mapping
+from functools import cache
 from textwrap import dedent
 
 from loguru import logger
@@ -34,6 +35,7 @@ RuleQueryResult = tuple[int, int]
 LocationQueryResult = tuple[int]
 
 
+@cache
 def _validate_query_result[T](result_type: type[T]) -> DatabaseResultConverter[T]:
     return TypeAdapter(result_type).validate_python
 
@@ -354,6 +354,19 @@ class Graph:
         self._dirty = True
         _ = self._graph.add_edge(n1.node_id, n2.node_id, edge)
 
+    def add_edges(self, edges: Iterable[tuple[Node, Node, Edge]]) -> None:
+        # Validate and deduplicate first, then add all new edges in one call.
+        new_edges: dict[tuple[int, int, Edge], None] = {}
+        for n1, n2, edge in edges:
+            edge.raise_if_disallowed(n1, n2)
+            if self.has_edge(n1, n2, edge):
+                continue
+            new_edges[(n1.node_id, n2.node_id, edge)] = None
+
+        if new_edges:
+            self._dirty = True
+            _ = self._graph.add_edges_from(list(new_edges))
+
     def has_node(self, node: Node) -> bool:
         return node.node_id >= 0 and self._graph.has_node(node.node_id)
 
@@ -37,7 +37,7 @@ from .collection_info import ModuleInfo, get_collection_index
 from .module_scanner import extract_module_dependencies
 from .report import generate_report
 from .types import CollectionUsage, ModuleUsage, ProjectDependencies, RoleUsage
-from .vulnerabilities import find_vulnerabilities
+from .vulnerabilities import find_vulnerabilities_many
 
 
 def _find_role(name: str) -> Path | None:
@@ -142,10 +142,7 @@ def scan_project(
         for dep in deps:
             unique_dependencies.add((dep.name, dep.type))
 
-    dep_vulns = {
-        dep_name: find_vulnerabilities(dep_name, dep_type)
-        for dep_name, dep_type in unique_dependencies
-    }
+    dep_vulns = find_vulnerabilities_many(unique_dependencies)
 
     _print_dependencies(project_deps)
 
@@ -17,6 +17,7 @@ COLLECTION_PATHS = [
 ]
 
 COLLECTION_CONTENT_PATH = Path("cache") / "collection_content.json"
+JINJA_CACHE_PATH = Path("cache") / "jinja"
 
 MODULE_SCA_PATH = (
     Path("DependencyPatternMatcher")
@@ -29,22 +30,33 @@ MODULE_SCA_PROJECT_TIMEOUT = 60 * 60 * 60  # 1 hour
 MODULE_SCA_JAVA_MAX_HEAP_SIZE = "64G"
 
 
-ANSIBLE_BUILTIN_IGNORES = {
-    "systemd",
-    "ssl",
-    "syslog",
-    "gssapi",
-    "urllib3",
-    "ansible",
-    "locale",
-}
+ANSIBLE_BUILTIN_IGNORES = frozenset(
+    {
+        "systemd",
+        "ssl",
+        "syslog",
+        "gssapi",
+        "urllib3",
+        "ansible",
+        "locale",
+    }
+)
 
-PYTHON_BUILTINS = set(sys.builtin_module_names) | {
+PYTHON_BUILTINS = frozenset(sys.builtin_module_names) | {
     pkg.name
     for pkg in pkgutil.iter_modules()
     if pkg.module_finder.path.startswith(str(Path(pkgutil.__file__).parent))
 }
 
+# Dependency type for each pattern reported by the DependencyPatternMatcher.
+DEPENDENCY_PATTERN_TYPES = {
+    "GuardedImport": "Python",
+    "CommunityGeneralDeps": "Python",
+    "DynamicImport": "Python",
+    "GetBinPath": "OS",
+    "CommunityGeneralCmdRunner": "OS",
+}
+
 DEBIAN_NAME_MAPPINGS = {
     "docker": "docker.io",
     "python": "python3.12",
@@ -4,6 +4,7 @@ from typing import overload
 
 import csv
 import json
+import os
 import subprocess
 from collections import defaultdict
 from collections.abc import Mapping, Sequence
@@ -15,6 +16,7 @@ import ansible
 from scansible.sca.constants import (
     ANSIBLE_BUILTIN_IGNORES,
     COLLECTION_PATHS,
+    DEPENDENCY_PATTERN_TYPES,
     MODULE_SCA_JAVA_MAX_HEAP_SIZE,
     MODULE_SCA_PATH,
     MODULE_SCA_PROJECT_TIMEOUT,
@@ -49,10 +51,11 @@ class Cache:
             for mod, deps in values.items():
                 dct[mod] = [{"name": dep.name, "type": dep.type} for dep in deps]
 
-        old_cache = self._cache
-        self._cache_path.write_text(json.dumps(cache_dct))
-        self._read_cache()
-        assert old_cache == self._cache
+        # Write to a temporary file first and swap it in, so that an interrupted
+        # write cannot leave a truncated cache behind.
+        tmp_path = self._cache_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(cache_dct))
+        os.replace(tmp_path, self._cache_path)
 
     def __contains__(self, key: str) -> bool:
         return key in self._cache
@@ -182,11 +185,8 @@ def _parse_output(output_file: Path) -> Mapping[str, Sequence[ModuleDependency]]
             continue
 
         mod_name = mod_path.removeprefix("modules/")
-        if pattern in ("GuardedImport", "CommunityGeneralDeps", "DynamicImport"):
-            dep_type = "Python"
-        elif pattern in ("GetBinPath", "CommunityGeneralCmdRunner"):
-            dep_type = "OS"
-        else:
+        dep_type = DEPENDENCY_PATTERN_TYPES.get(pattern)
+        if dep_type is None:
             raise ValueError(f"Unknown pattern: {pattern}")
 
         if coll_name == "ansible.builtin" and dep_name in ANSIBLE_BUILTIN_IGNORES:
@@ -2,15 +2,39 @@ from __future__ import annotations
 
 from typing import Any
 
+from collections import defaultdict
+from functools import lru_cache
 from pathlib import Path
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    select_autoescape,
+)
 
 from scansible.checks.security.rules.base import RuleResult
-from scansible.sca.constants import HTML_CLASS_SEVERITY
+from scansible.sca.constants import HTML_CLASS_SEVERITY, JINJA_CACHE_PATH
 
 from .types import ProjectDependencies, Vulnerability
 
+_jinja_env: Environment | None = None
+
+
+def _get_environment() -> Environment:
+    global _jinja_env
+    if _jinja_env is not None:
+        return _jinja_env
+
+    JINJA_CACHE_PATH.mkdir(parents=True, exist_ok=True)
+    _jinja_env = Environment(
+        loader=FileSystemLoader("src/scansible/sca/html"),
+        autoescape=select_autoescape(),
+        bytecode_cache=FileSystemBytecodeCache(str(JINJA_CACHE_PATH)),
+        auto_reload=False,
+    )
+    return _jinja_env
+
 
 def generate_report(
     project_name: str,
@@ -19,14 +43,18 @@ def generate_report(
     dependency_vulnerabilities: dict[str, list[Vulnerability]],
     smells_raw: list[RuleResult],
 ) -> None:
+    # Files may have changed since an earlier report in this process.
+    _read_lines.cache_clear()
+
     collections: list[dict[str, Any]] = []
     for coll in dependencies.collections:
         collections.append(
             {
                 "name": coll.name,
                 "modules": [
-                    mod._asdict()
-                    | {
+                    {
+                        "name": mod.name,
+                        "usages": mod.usages,
                         "num_usages": len(mod.usages),
                         "dependencies": dependencies.module_dependencies.get(
                             mod.name, []
@@ -41,28 +69,28 @@ def generate_report(
 
     modules = [mod for coll in collections for mod in coll["modules"]]
 
-    all_module_dependencies: dict[str, dict[str, Any]] = {}
+    dependency_index: defaultdict[str, dict[str, Any]] = defaultdict(
+        lambda: {"num_usages": 0, "modules": []}
+    )
     for mod, deps in dependencies.module_dependencies.items():
         for dep in deps:
-            if dep.name not in all_module_dependencies:
-                all_module_dependencies[dep.name] = {
-                    "name": dep.name,
-                    "type": dep.type,
-                    "num_usages": 0,
-                    "modules": [],
-                }
-            all_module_dependencies[dep.name]["num_usages"] += 1
-            all_module_dependencies[dep.name]["modules"].append(mod)
-    for dep in all_module_dependencies.values():
+            dep_entry = dependency_index[dep.name]
+            dep_entry.setdefault("type", dep.type)
+            dep_entry["num_usages"] += 1
+            dep_entry["modules"].append(mod)
+    # Don't let lookups of missing dependencies create empty entries.
+    all_module_dependencies = dict(dependency_index)
+    for dep_name, dep in all_module_dependencies.items():
+        dep["name"] = dep_name
         dep["vulnerabilities"] = [
-            vuln._asdict() for vuln in dependency_vulnerabilities[dep["name"]]
+            vuln._asdict() for vuln in dependency_vulnerabilities[dep_name]
         ]
         for vuln in dep["vulnerabilities"]:
-            vuln["severity_class"] = HTML_CLASS_SEVERITY.get(
-                vuln["severity"], "secondary"
-            )
-            if vuln["severity"] not in HTML_CLASS_SEVERITY:
+            severity_class = HTML_CLASS_SEVERITY.get(vuln["severity"])
+            if severity_class is None:
+                severity_class = "secondary"
                 vuln["severity"] = "unknown"
+            vuln["severity_class"] = severity_class
 
     vulnerabilities: list[dict[str, str]] = []
     for vulns in dependency_vulnerabilities.values():
@@ -86,11 +114,8 @@ def generate_report(
         )
         smells.append(sm)
 
-    env = Environment(
-        loader=FileSystemLoader("src/scansible/sca/html"),
-        autoescape=select_autoescape(),
-    )
-    env.globals = dict(
+    env = _get_environment()
+    report_vars = dict(
         project_name=project_name,
         collections=collections,
         modules=modules,
@@ -103,21 +128,24 @@ def generate_report(
 
     for html_file, _ in pages:
         template = env.get_template(f"{html_file}.html.j2")
-        content = template.render(current_file=html_file)
+        content = template.render(report_vars, current_file=html_file)
         (output_dir / f"{html_file}.html").write_text(content)
 
 
 def _read_code(loc: str, num_lines: int) -> tuple[str, int, int]:
     *file_path_str, lineno_raw, _ = loc.split(":")
     lineno = int(lineno_raw) - 1
-    file_path = Path(":".join(file_path_str))
     try:
-        text = file_path.read_text()
+        lines = _read_lines(":".join(file_path_str))
     except IOError:
         return "NOT FOUND!", 0, 0
 
-    lines = text.splitlines()
     line_start = max(0, lineno - num_lines)
     line_end = min(len(lines) - 1, lineno + num_lines)
 
     return "\n".join(lines[line_start : line_end + 1]), line_start, lineno + 1
+
+
+@lru_cache(maxsize=256)
+def _read_lines(file_path: str) -> tuple[str, ...]:
+    return tuple(Path(file_path).read_text().splitlines())
@@ -2,10 +2,17 @@ from __future__ import annotations
 
 from typing import Any
 
+import atexit
 import json
+import os
+import threading
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from scansible.sca import CONSOLE
 from scansible.sca.constants import DEBIAN_NAME_MAPPINGS, ECOSYSTEMS_SEVERITY_MAPPING
@@ -13,35 +20,81 @@ from scansible.sca.types import Vulnerability
 
 CACHE_PATH = Path("cache")
 
+# Maximum number of concurrent advisory lookups.
+VULNERABILITY_LOOKUP_WORKERS = 16
+
 _debian_advisories_cache: dict[str, dict[str, Any]] | None = None
+_debian_advisories_lock = threading.Lock()
+
+
+def _create_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=16,
+        max_retries=Retry(total=3, backoff_factor=0.2),
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared session so that lookups reuse pooled connections instead of performing
+# a new TLS handshake for every package.
+_SESSION = _create_session()
+
+
+# Number of unsaved entries after which the ecosystems cache is written to disk.
+ECOSYSTEMS_CACHE_FLUSH_THRESHOLD = 32
 
 
 class EcosystemsCache:
     def __init__(self) -> None:
-        self._cache: dict[str, Any] = {}
+        self._cache: dict[tuple[str, str], Any] = {}
         self._cache_path = CACHE_PATH / "ecosystems_cache.json"
+        self._dirty = 0
+        self._lock = threading.Lock()
         if self._cache_path.is_file():
             self._read_cache()
+        atexit.register(self.flush)
 
     def _read_cache(self) -> None:
         cache_text = self._cache_path.read_text()
-        self._cache = json.loads(cache_text)
+        self._cache = {}
+        for key, value in json.loads(cache_text).items():
+            ecosystem, package = key.split(":", 1)
+            self._cache[ecosystem, package] = value
 
     def _write_cache(self) -> None:
-        self._cache_path.write_text(json.dumps(self._cache))
-
-    def _params_to_key(self, ecosystem: str, package: str) -> str:
-        return f"{ecosystem}:{package}"
+        cache_dct = {
+            f"{ecosystem}:{package}": value
+            for (ecosystem, package), value in self._cache.items()
+        }
+        tmp_path = self._cache_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(cache_dct))
+        os.replace(tmp_path, self._cache_path)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._dirty:
+            return
+        self._write_cache()
+        self._dirty = 0
 
     def __contains__(self, key: tuple[str, str]) -> bool:
-        return self._params_to_key(*key) in self._cache
+        return key in self._cache
 
     def set(self, ecosystem: str, package: str, value: Any) -> None:
-        self._cache[self._params_to_key(ecosystem, package)] = value
-        self._write_cache()
+        with self._lock:
+            self._cache[ecosystem, package] = value
+            self._dirty += 1
+            if self._dirty >= ECOSYSTEMS_CACHE_FLUSH_THRESHOLD:
+                self._flush()
 
     def get(self, ecosystem: str, package: str) -> Any:
-        return self._cache[self._params_to_key(ecosystem, package)]
+        return self._cache[ecosystem, package]
 
 
 ECOSYSTEMS_CACHE = EcosystemsCache()
@@ -54,21 +107,31 @@ def find_vulnerabilities(package_name: str, package_type: str) -> list[Vulnerabi
         return _find_pypi_vulnerabilities(package_name)
 
 
+def find_vulnerabilities_many(
+    dependencies: Iterable[tuple[str, str]],
+) -> dict[str, list[Vulnerability]]:
+    dependencies = list(dependencies)
+    with ThreadPoolExecutor(VULNERABILITY_LOOKUP_WORKERS) as executor:
+        results = executor.map(lambda dep: find_vulnerabilities(*dep), dependencies)
+        return {dep_name: vulns for (dep_name, _), vulns in zip(dependencies, results)}
+
+
 def _get_debian_advisories() -> dict[str, dict[str, Any]]:
     global _debian_advisories_cache
-    if _debian_advisories_cache is not None:
-        return _debian_advisories_cache
+    with _debian_advisories_lock:
+        if _debian_advisories_cache is not None:
+            return _debian_advisories_cache
 
-    adv_path = CACHE_PATH / "debian_advisories.json"
-    if not adv_path.is_file():
-        resp = requests.get("https://security-tracker.debian.org/tracker/data/json")
-        resp.raise_for_status()
-        adv_path.write_text(resp.text)
+        adv_path = CACHE_PATH / "debian_advisories.json"
+        if not adv_path.is_file():
+            resp = _SESSION.get("https://security-tracker.debian.org/tracker/data/json")
+            resp.raise_for_status()
+            adv_path.write_text(resp.text)
 
-    with adv_path.open("rt") as f:
-        content = json.load(f)
-        _debian_advisories_cache = content
-        return content
+        with adv_path.open("rt") as f:
+            content = json.load(f)
+            _debian_advisories_cache = content
+            return content
 
 
 def _find_debian_vulnerabilities(package_name: str) -> list[Vulnerability]:
@@ -138,7 +201,7 @@ def _search_ecosystems(ecosystem: str, package: str) -> dict[str, Any] | None:
     if (ecosystem, package) in ECOSYSTEMS_CACHE:
         return ECOSYSTEMS_CACHE.get(ecosystem, package)
 
-    resp = requests.get(
+    resp = _SESSION.get(
         f"https://packages.ecosyste.ms/api/v1/registries/{ecosystem}/packages/{package}"
     )
     if resp.status_code == 404:
@@ -4,7 +4,6 @@ from __future__ import annotations
 
 from typing import TypeVar, cast
 
-import itertools
 from collections.abc import Callable, Iterable, Mapping, Sequence
 
 
@@ -32,11 +31,20 @@ def first_where(it: Iterable[_T], predicate: Callable[[_T], bool]) -> _T | None:
 
 
 class FrozenDict(dict[_K, _V]):
+    __slots__ = ("_hash",)
+
+    _hash: int
+
     def __setitem__(self, k: _K, v: _V) -> None:
         raise RuntimeError("immutable")
 
     def __hash__(self) -> int:  # type: ignore[override]
-        return hash(frozenset(self.items()))
+        # The content never changes, so the hash only needs to be computed once.
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = hash(frozenset(self.items()))
+            return self._hash
 
 
 def make_immutable(obj: _T) -> _T:
@@ -53,12 +61,15 @@ def make_immutable(obj: _T) -> _T:
 
 
 def join_sequences(seq1: Sequence[_T], seq2: Sequence[_T]) -> Sequence[_T]:
-    return tuple(itertools.chain(seq1, seq2))
+    return (*seq1, *seq2)
 
 
 def ensure_sequence(obj: _T | Sequence[_T] | None) -> Sequence[_T]:
     if obj is None:
         return []
+    # Check the common concrete types first, the ABC check is much slower.
+    if isinstance(obj, (list, tuple)):
+        return cast(Sequence[_T], obj)
     if isinstance(obj, Sequence):
         return cast(Sequence[_T], obj)
     return [obj]
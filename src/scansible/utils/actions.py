@@ -3,38 +3,48 @@ from __future__ import annotations
 from ansible import constants
 from ansible.utils.fqcn import add_internal_fqcns
 
+# Ansible defines these as lists, snapshot them into sets for fast lookups.
+_SET_FACT = frozenset(constants._ACTION_SET_FACT)  # pyright: ignore
+_INCLUDE_VARS = frozenset(constants._ACTION_INCLUDE_VARS)  # pyright: ignore
+_ALL_INCLUDE_IMPORT_TASKS = frozenset(
+    constants._ACTION_ALL_INCLUDE_IMPORT_TASKS  # pyright: ignore
+)
+_INCLUDE_TASKS = frozenset(constants._ACTION_INCLUDE_TASKS)  # pyright: ignore
+_IMPORT_TASKS = frozenset(constants._ACTION_IMPORT_TASKS)  # pyright: ignore
+_ALL_PROPER_INCLUDE_IMPORT_ROLES = frozenset(
+    constants._ACTION_ALL_PROPER_INCLUDE_IMPORT_ROLES  # pyright: ignore
+)
+_IMPORT_PLAYBOOK = frozenset(constants._ACTION_IMPORT_PLAYBOOK)  # pyright: ignore
+_BARE_INCLUDE = frozenset(add_internal_fqcns(["include"]))
+
 
 def is_set_fact(action: str) -> bool:
-    return action in constants._ACTION_SET_FACT  # pyright: ignore
+    return action in _SET_FACT
 
 
 def is_include_vars(action: str) -> bool:
-    return action in constants._ACTION_INCLUDE_VARS  # pyright: ignore
+    return action in _INCLUDE_VARS
 
 
 def is_import_include_tasks(action: str) -> bool:
-    return action in constants._ACTION_ALL_INCLUDE_IMPORT_TASKS or is_bare_include(
-        action
-    )  # pyright: ignore
+    return action in _ALL_INCLUDE_IMPORT_TASKS or is_bare_include(action)
 
 
 def is_include_tasks(action: str) -> bool:
-    return action in constants._ACTION_INCLUDE_TASKS  # pyright: ignore
+    return action in _INCLUDE_TASKS
 
 
 def is_import_tasks(action: str) -> bool:
-    return action in constants._ACTION_IMPORT_TASKS  # pyright: ignore
+    return action in _IMPORT_TASKS
 
 
 def is_import_include_role(action: str) -> bool:
-    return (
-        action in constants._ACTION_ALL_PROPER_INCLUDE_IMPORT_ROLES  # pyright: ignore
-    )
+    return action in _ALL_PROPER_INCLUDE_IMPORT_ROLES
 
 
 def is_import_playbook(action: str) -> bool:
-    return action in constants._ACTION_IMPORT_PLAYBOOK  # pyright: ignore
+    return action in _IMPORT_PLAYBOOK
 
 
 def is_bare_include(action: str) -> bool:
-    return action in add_internal_fqcns(["include"])
+    return action in _BARE_INCLUDE
@@ -5,37 +5,45 @@ from __future__ import annotations
 from typing import Any, Literal, cast
 
 import os
+import threading
 from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import redirect_stderr
 from pathlib import Path
 
 from ansible.errors import AnsibleError
 from ansible.parsing.dataloader import DataLoader
 
+#: Number of threads used to scan the top-level directories of a project.
+ENTRYPOINT_SCAN_WORKERS = 16
 
-def is_entrypoint(path: Path) -> bool:
+_parse_lock = threading.Lock()
+
+
+def is_entrypoint(path: Path, is_dir: bool | None = None) -> bool:
     """Check whether a file or directory is an Ansible entrypoint.
 
     If `path` is a directory and this returns True, then the entrypoint is a
     role. If `path` is a file and this returns True, then the entrypoint is a
-    playbook."""
+    playbook. `is_dir` can be provided when the caller already knows whether
+    `path` is a directory, to avoid another `stat` call."""
 
-    # Hidden files or directories are unlikely to be entrypoints.
-    if path.name.startswith("."):
+    if _is_ignored_name(path.name):
         return False
 
-    if "test" in path.name.lower() or "molecule" in path.name.lower():
-        return False
+    if is_dir is None:
+        is_dir = path.is_dir()
 
-    if path.is_dir():
+    if is_dir:
         # Quickly check whether this could be a role based on the child
         # directories.
 
         # Must have a tasks/main.yml or tasks/main.yaml file, otherwise nothing
         # to execute.
-        return (path / "tasks" / "main.yaml").is_file() or (
-            path / "tasks" / "main.yml"
-        ).is_file()
+        tasks_dir = os.path.join(path, "tasks")
+        return os.path.isfile(os.path.join(tasks_dir, "main.yaml")) or os.path.isfile(
+            os.path.join(tasks_dir, "main.yml")
+        )
 
     # Ansible entrypoints are generally YAML files. JSON is possible, but
     # extraordinarily improbable. Some files have no extension but are still
@@ -48,13 +56,23 @@ def is_entrypoint(path: Path) -> bool:
     # To quickly filter out definite non-playbooks without attempting to parse,
     # we'll read the content of the file and check whether it contains "hosts"
     # or "import_playbook". If not, it's definitely not a (working) playbook.
-    content = path.read_text(errors="ignore")
-    if "hosts" not in content and "import_playbook" not in content:
+    # The check is done on the raw bytes so that non-playbooks are never
+    # decoded. It isn't limited to the start of the file, since the first
+    # "hosts" directive may follow an arbitrarily large play.
+    raw_content = path.read_bytes()
+    if b"hosts" not in raw_content and b"import_playbook" not in raw_content:
         return False
 
+    content = raw_content.decode(errors="ignore")
+
     # Finally, parse the YAML and check in more detail
     try:
-        with open(os.devnull, "w") as devnull, redirect_stderr(devnull):
+        # Redirecting stderr isn't thread-safe, so serialise the parsing.
+        with (
+            _parse_lock,
+            open(os.devnull, "w") as devnull,
+            redirect_stderr(devnull),
+        ):
             yaml_obj = DataLoader().load(content)
     except AnsibleError:
         # If the file fails to parse, don't consider it an entrypoint.
@@ -70,6 +88,16 @@ def is_entrypoint(path: Path) -> bool:
     )
 
 
+def _is_ignored_name(name: str) -> bool:
+    # Hidden files or directories are unlikely to be entrypoints, and neither
+    # are tests.
+    if name.startswith("."):
+        return True
+
+    name = name.lower()
+    return "test" in name or "molecule" in name
+
+
 def find_entrypoints(root: Path) -> list[tuple[Path, Literal["role", "playbook"]]]:
     """Find all entrypoints in a directory and return their paths and types."""
 
@@ -81,17 +109,55 @@ def _find_entrypoints(root: Path) -> Iterable[tuple[Path, Literal["role", "playb
         return
 
     # Check current path.
-    if is_entrypoint(root):
-        yield root, "playbook" if root.is_file() else "role"
-
-    if (
-        root.is_file()
-        or root.name.startswith(".")
-        or "test" in root.name.lower()
-        or "molecule" in root.name.lower()
-    ):
+    root_is_dir = root.is_dir()
+    if is_entrypoint(root, root_is_dir):
+        yield root, "role" if root_is_dir else "playbook"
+
+    if not root_is_dir or _is_ignored_name(root.name):
         return
 
-    if root.is_dir():
-        for child in root.iterdir():
-            yield from _find_entrypoints(child)
+    yield from _find_entrypoints_in_dir(str(root), parallel=True)
+
+
+def _find_entrypoints_in_dir(
+    dir_path: str, parallel: bool = False
+) -> Iterable[tuple[Path, Literal["role", "playbook"]]]:
+    # Use scandir rather than Path.iterdir, as the directory entries cache the
+    # file type, saving a stat call per check.
+    with os.scandir(dir_path) as it:
+        # Materialise the entries so the directory handle is closed before
+        # descending into the children.
+        entries = list(it)
+
+    if not parallel or len(entries) < 2:
+        for entry in entries:
+            yield from _find_entrypoints_in_entry(entry)
+        return
+
+    # Scanning is mostly I/O-bound, so scan each child in its own thread.
+    # Results are still yielded in directory order.
+    with ThreadPoolExecutor(ENTRYPOINT_SCAN_WORKERS) as executor:
+        for child_entrypoints in executor.map(
+            lambda entry: list(_find_entrypoints_in_entry(entry)), entries
+        ):
+            yield from child_entrypoints
+
+
+def _find_entrypoints_in_entry(
+    entry: os.DirEntry[str],
+) -> Iterable[tuple[Path, Literal["role", "playbook"]]]:
+    # Ignored entries are neither entrypoints themselves, nor do we look for
+    # entrypoints inside of them.
+    if entry.is_symlink() or _is_ignored_name(entry.name):
+        return
+
+    entry_is_dir = entry.is_dir(follow_symlinks=False)
+    if not entry_is_dir and not entry.is_file(follow_symlinks=False):
+        return
+
+    entry_path = Path(entry.path)
+    if is_entrypoint(entry_path, entry_is_dir):
+        yield entry_path, "role" if entry_is_dir else "playbook"
+
+    if entry_is_dir:
+        yield from _find_entrypoints_in_dir(entry.path)
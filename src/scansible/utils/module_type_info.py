@@ -2,12 +2,16 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, override
 
+import hashlib
 import json
+import os
 import subprocess
 from collections import defaultdict
 from collections.abc import Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 
 import rich.progress
@@ -15,12 +19,14 @@ from loguru import logger
 from pydantic import (
     BaseModel,
     Field,
+    PrivateAttr,
     SerializationInfo,
     SerializerFunctionWrapHandler,
     model_serializer,
 )
 
-from scansible.utils import first
+#: Number of modules to document per ansible-doc invocation.
+ANSIBLE_DOC_BATCH_SIZE = 200
 
 
 class OptionInfo(BaseModel, frozen=True, extra="forbid"):
@@ -87,70 +93,54 @@ class ModuleInfo(BaseModel, frozen=True, extra="forbid"):
     metadata: object = Field(default=None)
     returns: Mapping[str, ReturnInfo] | None = Field(default=None)
 
+    # Computed once on construction, as they're queried repeatedly when ranking
+    # candidate modules and resolving option aliases.
+    _all_option_names: frozenset[str] = PrivateAttr()
+    _alias_to_canonical: Mapping[str, str] = PrivateAttr()
+
+    @override
+    def model_post_init(self, context: Any, /) -> None:
+        alias_to_canonical: dict[str, str] = {}
+        for optname, opt in self.options.items():
+            for alias in opt.aliases:
+                _ = alias_to_canonical.setdefault(alias, optname)
+        self._alias_to_canonical = alias_to_canonical
+        self._all_option_names = frozenset(self.options).union(alias_to_canonical)
+
     @property
     def qualified_name(self) -> str:
         return f"{self.collection}.{self.short_name}"
 
     @property
-    def all_option_names(self) -> set[str]:
-        options: set[str] = set()
-        for optname, opt in self.options.items():
-            options.add(optname)
-            options |= set(opt.aliases)
-        return options
+    def all_option_names(self) -> frozenset[str]:
+        return self._all_option_names
 
     def get_canonical_option_name(self, option_name: str) -> str | None:
         if option_name in self.options:
             return option_name
 
-        return first(
-            canonical_name
-            for canonical_name, opt in self.options.items()
-            if option_name in opt.aliases
-        )
+        return self._alias_to_canonical.get(option_name)
 
     @model_serializer(mode="wrap")
     def _slim_dump(
         self, nxt: SerializerFunctionWrapHandler, info: SerializationInfo
     ) -> dict[str, Any]:
         serialized = nxt(self)
-        if not info.context.get("slim", False):
+        if not (info.context or {}).get("slim", False):
             return serialized
 
-        def deep_slim(value: object) -> object:
-            match value:
-                case dict():
-                    return {
-                        k: deep_slim_dict_item(k, v)
-                        for k, v in value.items()
-                        if v is not None
-                    }
-                case list():
-                    return [deep_slim(e) for e in value]
-                case _:
-                    return value
-
-        def deep_slim_dict_item(key: str, value: object) -> object:
-            match key:
-                case "examples":
-                    return ""
-                case "notes" | "requirements":
-                    return []
-                case "returns" if isinstance(value, dict):
-                    _ = value.pop("description", None)
-                    _ = value.pop("sample", None)
-                    return deep_slim(value)
-                case "description" if isinstance(value, list):
-                    return []
-                case "description" if isinstance(value, str):
-                    return ""
-                case _:
-                    return deep_slim(value)
-
-        return deep_slim(serialized)
+        return _slim_module_dump(serialized)
 
     @classmethod
-    def load(cls, info: dict[str, Any]) -> ModuleInfo:  # type: ignore[misc]
+    def load(cls, info: dict[str, Any], full_dump: bool = False) -> ModuleInfo:  # type: ignore[misc]
+        """Load a module's info from its dump.
+
+        If `full_dump` is True, `info` must be a full (non-slim) dump. Such a
+        dump is complete, so it's validated in a single pass instead of
+        parsing each option separately."""
+        if full_dump:
+            return cls.model_validate(info)
+
         info = dict(info)
         info["options"] = {
             option_name: OptionInfo.parse(
@@ -167,15 +157,36 @@ class ModuleInfo(BaseModel, frozen=True, extra="forbid"):
         ansible_doc_bin_path: str = "ansible-doc",
         module_path: Path | None = None,
     ) -> ModuleInfo:
+        return cls.parse_batch_from_ansible(
+            [module_qualified_name], ansible_doc_bin_path, module_path
+        )[module_qualified_name]
+
+    @classmethod
+    def parse_batch_from_ansible(
+        cls,
+        module_qualified_names: Sequence[str],
+        ansible_doc_bin_path: str = "ansible-doc",
+        module_path: Path | None = None,
+    ) -> dict[str, ModuleInfo]:
+        """Parse the documentation of multiple modules in one ansible-doc call."""
         cmd = [ansible_doc_bin_path, "-j", "-t", "module"]
         if module_path is not None:
             cmd.extend(["-M", str(module_path)])
-        cmd.append(module_qualified_name)
+        cmd.extend(module_qualified_names)
 
         info_proc = subprocess.run(cmd, capture_output=True)
         response = json.loads(info_proc.stdout)
-        info = response[module_qualified_name]
 
+        modules: dict[str, ModuleInfo] = {}
+        for name in module_qualified_names:
+            if name not in response:
+                logger.warning(f"No documentation found for module {name}")
+                continue
+            modules[name] = cls.from_ansible_doc_json(response[name])
+        return modules
+
+    @classmethod
+    def from_ansible_doc_json(cls, info: dict[str, Any]) -> ModuleInfo:  # type: ignore[misc]
         doc = info["doc"]
         return cls(
             collection=doc["collection"],
@@ -201,6 +212,89 @@ class ModuleInfo(BaseModel, frozen=True, extra="forbid"):
         )
 
 
+# Slim dumps strip documentation that isn't needed to analyse module usages. The
+# module, option, and return value dumps have a known structure, so only their
+# documentation fields are stripped, rather than any key with a documentation
+# field's name, which could also be the name of an option or return value.
+# Free-form values, such as attributes and option defaults, are stripped
+# generically.
+
+
+def _slim_module_dump(dumped: dict[str, Any]) -> dict[str, Any]:
+    slim = {k: v for k, v in dumped.items() if v is not None}
+    slim["description"] = []
+    slim["examples"] = ""
+    slim["notes"] = []
+    slim["requirements"] = []
+    slim["attributes"] = _deep_slim(slim["attributes"])
+    slim["options"] = {
+        name: _slim_option_dump(option) for name, option in slim["options"].items()
+    }
+    if "metadata" in slim:
+        slim["metadata"] = _deep_slim(slim["metadata"])
+    if "returns" in slim:
+        slim["returns"] = {
+            name: _slim_return_dump(ret) for name, ret in slim["returns"].items()
+        }
+    return slim
+
+
+def _slim_option_dump(dumped: dict[str, Any]) -> dict[str, Any]:
+    slim = {k: v for k, v in dumped.items() if v is not None}
+    slim["description"] = []
+    for key in ("default", "choices"):
+        if key in slim:
+            slim[key] = _deep_slim(slim[key])
+    if "suboptions" in slim:
+        slim["suboptions"] = {
+            name: _slim_option_dump(option)
+            for name, option in slim["suboptions"].items()
+        }
+    return slim
+
+
+def _slim_return_dump(dumped: object) -> object:
+    if not isinstance(dumped, dict):
+        return _deep_slim(dumped)
+
+    slim = {
+        k: _deep_slim(v)
+        for k, v in dumped.items()
+        if v is not None and k not in ("description", "sample", "contains")
+    }
+    if isinstance(contains := dumped.get("contains"), dict):
+        slim["contains"] = {
+            name: _slim_return_dump(ret) for name, ret in contains.items()
+        }
+    return slim
+
+
+def _deep_slim(value: object) -> object:
+    match value:
+        case dict():
+            return {
+                k: _deep_slim_dict_item(k, v) for k, v in value.items() if v is not None
+            }
+        case list():
+            return [_deep_slim(e) for e in value]
+        case _:
+            return value
+
+
+def _deep_slim_dict_item(key: str, value: object) -> object:
+    match key:
+        case "examples":
+            return ""
+        case "notes" | "requirements":
+            return []
+        case "description" if isinstance(value, list):
+            return []
+        case "description" if isinstance(value, str):
+            return ""
+        case _:
+            return _deep_slim(value)
+
+
 class ModuleKnowledgeBase:
     def __init__(self, modules: dict[str, ModuleInfo]) -> None:
         self.modules = modules
@@ -217,18 +311,66 @@ class ModuleKnowledgeBase:
             run_args.extend(["-M", str(module_path)])
 
         all_modules_resp = subprocess.run(run_args, capture_output=True).stdout
-        all_module_names = json.loads(all_modules_resp).keys()
+        all_module_names = list(json.loads(all_modules_resp).keys())
+
+        # Each ansible-doc invocation has a considerable start-up cost, so query
+        # the modules in batches rather than one by one.
+        batches = [
+            all_module_names[i : i + ANSIBLE_DOC_BATCH_SIZE]
+            for i in range(0, len(all_module_names), ANSIBLE_DOC_BATCH_SIZE)
+        ]
+
+        parse_batch = partial(
+            ModuleInfo.parse_batch_from_ansible,
+            ansible_doc_bin_path=ansible_doc_bin_path,
+            module_path=module_path,
+        )
 
         modules: dict[str, ModuleInfo] = {}
-        for mod in rich.progress.track(
-            all_module_names, description=f"Scanning {len(all_module_names)} modules"
-        ):
-            modules[mod] = ModuleInfo.parse_from_ansible(
-                mod, ansible_doc_bin_path, module_path
-            )
+        # The batches are independent, so document them in parallel.
+        with ProcessPoolExecutor() as executor:
+            for batch_modules in rich.progress.track(
+                executor.map(parse_batch, batches),
+                total=len(batches),
+                description=f"Scanning {len(all_module_names)} modules",
+            ):
+                modules |= batch_modules
 
         return cls(modules)
 
+    @classmethod
+    def init_cached(
+        cls,
+        cache_dir: Path,
+        ansible_doc_bin_path: str = "ansible-doc",
+        module_path: Path | None = None,
+    ) -> ModuleKnowledgeBase:
+        """Initialise from the Ansible docs, reusing a previously cached result.
+
+        The cache is keyed by the ansible-doc binary, the module path, and the
+        ansible-doc version."""
+        version = subprocess.run(
+            [ansible_doc_bin_path, "--version"], capture_output=True, check=True
+        ).stdout
+        cache_key = hashlib.sha256(
+            b"\0".join(
+                [ansible_doc_bin_path.encode(), str(module_path).encode(), version]
+            )
+        ).hexdigest()
+        cache_path = cache_dir / f"module_kb_{cache_key[:16]}.json"
+
+        if cache_path.is_file():
+            return cls.load_from_file(cache_path, full_dump=True)
+
+        kb = cls.init_from_ansible_docs(ansible_doc_bin_path, module_path)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first and swap it in, so that an interrupted
+        # write cannot leave a truncated cache behind.
+        tmp_path = cache_path.with_suffix(".json.tmp")
+        kb.dump_to_file(tmp_path, slim=False)
+        os.replace(tmp_path, cache_path)
+        return kb
+
     def dump(self, slim: bool = True) -> dict[str, Any]:
         return {
             mod_name: mod_info.model_dump(context={"slim": slim})
@@ -236,17 +378,38 @@ class ModuleKnowledgeBase:
         }
 
     def dump_to_file(self, file_path: Path, slim: bool = True) -> None:
+        # Encode one module at a time rather than building the dump of the
+        # whole knowledge base in memory first. The output is identical to
+        # json.dump(self.dump(slim), f, sort_keys=True, indent=2).
         with file_path.open("wt") as f:
-            json.dump(self.dump(slim), f, sort_keys=True, indent=2)
+            if not self.modules:
+                f.write("{}")
+                return
+
+            separator = "{\n  "
+            for mod_name in sorted(self.modules):
+                mod_dump = self.modules[mod_name].model_dump(context={"slim": slim})
+                mod_json = json.dumps(mod_dump, sort_keys=True, indent=2)
+                f.write(f"{separator}{json.dumps(mod_name)}: ")
+                f.write(mod_json.replace("\n", "\n  "))
+                separator = ",\n  "
+            f.write("\n}")
 
     @classmethod
-    def load(cls, info: dict[str, Any]) -> ModuleKnowledgeBase:  # type: ignore[misc]
-        return cls({name: ModuleInfo.load(modinfo) for name, modinfo in info.items()})
+    def load(cls, info: dict[str, Any], full_dump: bool = False) -> ModuleKnowledgeBase:  # type: ignore[misc]
+        return cls(
+            {
+                name: ModuleInfo.load(modinfo, full_dump)
+                for name, modinfo in info.items()
+            }
+        )
 
     @classmethod
-    def load_from_file(cls, file_path: Path) -> ModuleKnowledgeBase:
+    def load_from_file(
+        cls, file_path: Path, full_dump: bool = False
+    ) -> ModuleKnowledgeBase:
         with file_path.open("rt") as f:
-            return cls.load(json.load(f))
+            return cls.load(json.load(f), full_dump)
 
     def is_qualified_module_name(self, name: str) -> bool:
         return name in self.modules
@@ -262,10 +425,10 @@ class ModuleKnowledgeBase:
             return []
 
         # Rank by how many of the used options are supported by the module
-        def calc_overlap(mod: ModuleInfo) -> int:
-            return len(set(options) & mod.all_option_names)
-
-        candidates_scored = [(cand, calc_overlap(cand)) for cand in candidates]
+        options_set = frozenset(options)
+        candidates_scored = [
+            (cand, len(options_set & cand.all_option_names)) for cand in candidates
+        ]
         highest_score = max(score for _, score in candidates_scored)
 
         return [
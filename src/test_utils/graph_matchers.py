@@ -3,18 +3,49 @@
 from __future__ import annotations
 
 import operator
-from collections.abc import Iterable
+from collections import defaultdict, deque
+from collections.abc import Callable, Hashable, Iterable
+from functools import cache
 
 from scansible.representations.pdg import Edge, Graph, IntermediateValue, Node
 
 
-def _match_node(n1: Node, n2: Node, match_locations: bool) -> bool:
+def _node_signature(n: Node, match_locations: bool) -> Hashable:
+    """Get a hashable signature of a node that is equal for matching nodes."""
+    node_type = type(n)
+    return node_type, _get_signature_fields(node_type, match_locations)(n)
+
+
+@cache
+def _get_signature_fields(
+    node_type: type[Node], match_locations: bool
+) -> Callable[[Node], Hashable]:
+    """Get a getter for the fields of a node type that are part of its signature."""
     ignored_kws = {"node_id"} if match_locations else {"node_id", "location"}
+    field_names = [name for name in node_type.model_fields if name not in ignored_kws]
+    if not field_names:
+        return lambda _: ()
+    return operator.attrgetter(*field_names)
 
-    return type(n1) is type(n2) and (
-        not isinstance(n1, IntermediateValue)
-        and n1.model_dump(exclude=ignored_kws) == n2.model_dump(exclude=ignored_kws)
-    )
+
+def _partition_ivs(nodes: Iterable[Node]) -> tuple[list[Node], list[Node]]:
+    """Split nodes into intermediate values and other nodes, keeping their order."""
+    ivs: list[Node] = []
+    non_ivs: list[Node] = []
+    for n in nodes:
+        (ivs if isinstance(n, IntermediateValue) else non_ivs).append(n)
+    return ivs, non_ivs
+
+
+def _get_neighbor_ids(
+    edges: Iterable[tuple[Node, Node, Edge]],
+) -> defaultdict[int, set[int]]:
+    """Get the IDs of the predecessors and successors of all nodes at once."""
+    neighbors: defaultdict[int, set[int]] = defaultdict(set)
+    for src, target, _ in edges:
+        neighbors[src.node_id].add(target.node_id)
+        neighbors[target.node_id].add(src.node_id)
+    return neighbors
 
 
 def assert_graphs_match(
@@ -32,88 +63,105 @@ def assert_graphs_match(
         f"Mismatching role version: Expected {g2.role_version}, got {g1.role_version}"
     )
 
-    # Compare nodes
-    nodes1 = set(g1.nodes)
-    nodes2 = set(g2.nodes)
-    correspondences: dict[Node, Node] = {}
-    for n1 in sorted(nodes1, key=operator.attrgetter("node_id")):
-        if isinstance(n1, IntermediateValue):
-            continue
-
-        for n2 in sorted(nodes2, key=operator.attrgetter("node_id")):
-            if _match_node(n1, n2, match_locations):
-                nodes2.remove(n2)
-                correspondences[n1] = n2
-                break
-        else:
+    # Compare nodes. Nodes are tracked by ID rather than in sets or dicts, as
+    # hashing a node hashes all of its fields. IVs are matched separately
+    # below, so split them off from the other nodes up front.
+    nodes1 = g1.nodes
+    ivs1, non_ivs1 = _partition_ivs(nodes1)
+    ivs2, non_ivs2 = _partition_ivs(g2.nodes)
+
+    # Bucket the nodes of the second graph by signature, so that each node of
+    # the first graph can find its match without scanning the whole graph.
+    # Graph.nodes lists nodes in node ID order, so buckets are in node ID order
+    # too and identical nodes are paired up in order, without sorting.
+    nodes2_by_signature: defaultdict[Hashable, deque[Node]] = defaultdict(deque)
+    for n2 in non_ivs2:
+        nodes2_by_signature[_node_signature(n2, match_locations)].append(n2)
+
+    # Correspondences map node IDs of g1 to node IDs of g2. Node IDs are dense
+    # indices into the graph, so a list indexed by node ID suffices. Matched
+    # nodes are popped from their bucket, so the nodes left in the buckets
+    # afterwards are the unmatched ones.
+    id_correspondences = [-1] * (max((n1.node_id for n1 in nodes1), default=-1) + 1)
+    for n1 in non_ivs1:
+        candidates = nodes2_by_signature.get(_node_signature(n1, match_locations))
+        if not candidates:
             raise AssertionError(f"Unexpected node {n1!r} in first graph")
 
-    for n2 in nodes2:
-        if not isinstance(n2, IntermediateValue):
-            raise AssertionError(f"Missing node {n2!r} in first graph")
+        id_correspondences[n1.node_id] = candidates.popleft().node_id
+
+    for n2 in (n2 for bucket in nodes2_by_signature.values() for n2 in bucket):
+        raise AssertionError(f"Missing node {n2!r} in first graph")
 
     # Construct correspondences between intermediate values.
     # For every n1 in g1, find a node n2 in g2 whose neighbours all correspond
-    # to n1's neighbors.
-    for n1 in nodes1:
-        if n1 in correspondences:
-            continue
-        assert isinstance(n1, IntermediateValue), "Only IVs expected here"
-        n1_neighbors = g1.get_neighbors(n1)
+    # to n1's neighbors. The neighbours of all nodes are computed once, by node
+    # ID, so that matching doesn't need to walk or hash the graphs' nodes.
+    edges1 = g1.edges
+    edges2 = g2.edges
+    neighbors1 = _get_neighbor_ids(edges1)
+    neighbors2 = _get_neighbor_ids(edges2)
+    nodes1_by_id = {n1.node_id: n1 for n1 in nodes1}
+    # Index the IVs of g2 by their neighbours, so that each IV of g1 can look
+    # up its match directly. IVs between the same nodes are paired up in node
+    # ID order.
+    ivs2_by_neighbors: defaultdict[frozenset[int], deque[Node]] = defaultdict(deque)
+    for n2 in ivs2:
+        ivs2_by_neighbors[frozenset(neighbors2[n2.node_id])].append(n2)
+    iv_ids1 = {n1.node_id for n1 in ivs1}
+    for n1 in ivs1:
+        n1_neighbors = neighbors1[n1.node_id]
 
         if not n1_neighbors:
             raise AssertionError(
                 "Disconnected intermediate value in first graph. Cannot handle that"
             )
 
-        if any(isinstance(cn, IntermediateValue) for cn in n1_neighbors):
+        if not iv_ids1.isdisjoint(n1_neighbors):
             raise AssertionError(
                 f"Chain of intermediate values with {n1!r} in first graph. Cannot handle those."
             )
 
         # Map n1's neighbors to the corresponding nodes in g2.
-        n1_neighbors_in_g2 = {correspondences[cn] for cn in n1_neighbors}
+        n1_neighbors_in_g2 = frozenset(id_correspondences[cn] for cn in n1_neighbors)
         assert len(n1_neighbors_in_g2) == len(n1_neighbors)
 
-        # All candidate n2s, which are all neighbors of the n1's neighbors mapped in g2.
-        n2_candidates = [
-            cand for cn2 in n1_neighbors_in_g2 for cand in g2.get_neighbors(cn2)
-        ]
-        found = False
-        for cand in n2_candidates:
-            if not isinstance(cand, IntermediateValue):
-                continue
-            if set(g2.get_neighbors(cand)) == n1_neighbors_in_g2 and cand in nodes2:
-                if found:
-                    raise AssertionError(
-                        "Multiple intermediate values between same nodes. Cannot handle that."
-                    )
-                found = True
-                correspondences[n1] = cand
-                nodes2.remove(cand)
-                break
-        else:
+        candidates = ivs2_by_neighbors.get(n1_neighbors_in_g2)
+        if not candidates:
+            n1_neighbor_nodes = [nodes1_by_id[cn] for cn in n1_neighbors]
             raise AssertionError(
-                f"Unexpected intermediate value {n1!r} of first graph (connected to {n1_neighbors}"
+                f"Unexpected intermediate value {n1!r} of first graph (connected to {n1_neighbor_nodes}"
             )
 
-    for n2 in nodes2:
-        raise AssertionError(f"Missing intermediate value {n2!r} in first graph")
-
-    # Compare edges
-    edges1 = set(g1.edges)
-    edges2 = set(g2.edges)
-    for e1_src, e1_target, e1_edge in edges1:
-        e2 = (correspondences[e1_src], correspondences[e1_target], e1_edge)
+        id_correspondences[n1.node_id] = candidates.popleft().node_id
 
-        if e2 not in edges2:
-            raise AssertionError(
-                f"Unexpected edge {e1_src!r} -[{e1_edge}]-> {e1_target!r} in first graph"
-            )
+    for n2 in (n2 for ivs2 in ivs2_by_neighbors.values() for n2 in ivs2):
+        raise AssertionError(f"Missing intermediate value {n2!r} in first graph")
 
-        edges2.remove(e2)
+    # Compare edges. Map the edges of both graphs onto the node IDs of the
+    # second graph, keeping the original edges for error reporting.
+    edges1_in_g2 = {
+        (
+            id_correspondences[e1_src.node_id],
+            id_correspondences[e1_target.node_id],
+            e1_edge,
+        ): (e1_src, e1_target, e1_edge)
+        for e1_src, e1_target, e1_edge in edges1
+    }
+    edges2_by_ids = {
+        (e2_src.node_id, e2_target.node_id, e2_edge): (e2_src, e2_target, e2_edge)
+        for e2_src, e2_target, e2_edge in edges2
+    }
+
+    for e1_src, e1_target, e1_edge in (
+        e1 for e2_ids, e1 in edges1_in_g2.items() if e2_ids not in edges2_by_ids
+    ):
+        raise AssertionError(
+            f"Unexpected edge {e1_src!r} -[{e1_edge}]-> {e1_target!r} in first graph"
+        )
 
-    for e2_src, e2_target, e2_edge in edges2:
+    for e2_ids in edges2_by_ids.keys() - edges1_in_g2.keys():
+        e2_src, e2_target, e2_edge = edges2_by_ids[e2_ids]
         raise AssertionError(
             f"Missing edge {e2_src!r} -[{e2_edge}]-> {e2_target!r} in first graph"
         )
@@ -131,6 +179,5 @@ def create_graph(
 ) -> Graph:
     g = Graph(role_name=role_name, role_version=role_version)
     g.add_nodes(nodes.values())
-    for src, target, edge in edges:
-        g.add_edge(nodes[src], nodes[target], edge)
+    g.add_edges((nodes[src], nodes[target], edge) for src, target, edge in edges)
     return g
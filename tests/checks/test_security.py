@@ -2,19 +2,17 @@
 
 from __future__ import annotations
 
-import sys
-from collections.abc import Iterator
-from contextlib import contextmanager
+from collections.abc import Callable, Iterator
+from contextlib import ExitStack
 from functools import partial
 from pathlib import Path
 
 import pytest
-from loguru import logger
 
 from scansible.checks.security import rules
 from scansible.checks.security.db import GraphDatabase
 from scansible.checks.security.rules.admin_by_default import AdminByDefaultRule
-from scansible.checks.security.rules.base import RuleResult
+from scansible.checks.security.rules.base import Rule, RuleResult
 from scansible.checks.security.rules.empty_password import EmptyPasswordRule
 from scansible.checks.security.rules.hardcoded_secret import HardcodedSecretRule
 from scansible.checks.security.rules.http_without_ssl_tls import HTTPWithoutSSLTLSRule
@@ -27,18 +25,31 @@ from scansible.checks.security.rules.unrestricted_ip_address import (
 from scansible.checks.security.rules.weak_crypto import WeakCryptoAlgorithmRule
 from scansible.representations.pdg import extract_pdg
 
+type PlaybookImporter = Callable[[str], tuple[Path, GraphDatabase]]
 
-@contextmanager
-def temp_import_pb(path: Path) -> Iterator[GraphDatabase]:
-    logger.remove()
-    pdg_ctx = extract_pdg(path, "test", "test", [])
-    _ = logger.add(sys.stderr, format="{level} {message}", level="DEBUG")
-    with GraphDatabase(pdg_ctx.graph) as graph_db:
-        yield graph_db
 
+@pytest.fixture
+def import_pb(tmp_path: Path) -> Iterator[PlaybookImporter]:
+    """Import a playbook into a graph database that is closed after the test."""
+    with ExitStack() as stack:
 
-def write_pb(content: str, path: Path) -> None:
-    _ = path.write_text(content)
+        def _import_pb(content: str) -> tuple[Path, GraphDatabase]:
+            pb_path = tmp_path / "pb.yml"
+            _ = pb_path.write_text(content)
+
+            pdg_ctx = extract_pdg(pb_path, "test", "test", [])
+
+            graph_db = stack.enter_context(GraphDatabase(pdg_ctx.graph))
+            return pb_path, graph_db
+
+        yield _import_pb
+
+
+_RULES_BY_TYPE = {type(rule): rule for rule in rules.get_all_rules()}
+
+
+def run_rule(rule_type: type[Rule], db: GraphDatabase) -> list[RuleResult]:
+    return _RULES_BY_TYPE[rule_type].run(db)
 
 
 def run_all_checks(db: GraphDatabase) -> list[RuleResult]:
@@ -53,9 +64,8 @@ def describe_hardcoded_secret_rule() -> None:
         RuleResult, HardcodedSecretRule.name, HardcodedSecretRule.description
     )
 
-    def matches_literal_on_task(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def matches_literal_on_task(import_pb: PlaybookImporter) -> None:
+        pb_path, graph_db = import_pb(
             """
             - hosts: localhost
               tasks:
@@ -63,17 +73,14 @@ def describe_hardcoded_secret_rule() -> None:
                   user:
                     name: me
                     password: sekrit
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = HardcodedSecretRule().run(graph_db)
+        results = run_rule(HardcodedSecretRule, graph_db)
 
         assert results == [_result(f"{pb_path}:7:31", f"{pb_path}:4:19")]
 
-    def matches_variable_on_task(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def matches_variable_on_task(import_pb: PlaybookImporter) -> None:
+        pb_path, graph_db = import_pb(
             """
             - hosts: localhost
               vars:
@@ -83,17 +90,14 @@ def describe_hardcoded_secret_rule() -> None:
                   user:
                     name: me
                     password: '{{ a_var }}'
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = HardcodedSecretRule().run(graph_db)
+        results = run_rule(HardcodedSecretRule, graph_db)
 
         assert results == [_result(f"{pb_path}:4:24", f"{pb_path}:6:19")]
 
-    def matches_2_chain_variable_on_task(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def matches_2_chain_variable_on_task(import_pb: PlaybookImporter) -> None:
+        pb_path, graph_db = import_pb(
             """
             - hosts: localhost
               vars:
@@ -104,34 +108,28 @@ def describe_hardcoded_secret_rule() -> None:
                   user:
                     name: me
                     password: '{{ another_var }}'
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = HardcodedSecretRule().run(graph_db)
+        results = run_rule(HardcodedSecretRule, graph_db)
 
         assert results == [_result(f"{pb_path}:4:24", f"{pb_path}:7:19")]
 
-    def matches_variable_name_with_literal(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def matches_variable_name_with_literal(import_pb: PlaybookImporter) -> None:
+        pb_path, graph_db = import_pb(
             """
             - hosts: localhost
               vars:
                 secret_password: sekrit
               tasks:
                 - debug: msg={{ secret_password }}
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = HardcodedSecretRule().run(graph_db)
+        results = run_rule(HardcodedSecretRule, graph_db)
 
         assert results == [_result(f"{pb_path}:4:34", f"{pb_path}:4:17")]
 
-    def matches_indirect_variable_name(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def matches_indirect_variable_name(import_pb: PlaybookImporter) -> None:
+        pb_path, graph_db = import_pb(
             """
             - hosts: localhost
               vars:
@@ -139,34 +137,32 @@ def describe_hardcoded_secret_rule() -> None:
                 secret_password: '{{ a_var }}'
               tasks:
                 - debug: msg={{ secret_password }}
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = HardcodedSecretRule().run(graph_db)
+        results = run_rule(HardcodedSecretRule, graph_db)
 
         assert results == [_result(f"{pb_path}:4:24", f"{pb_path}:5:17")]
 
-    def does_not_match_update_password_flag_as_literal(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def does_not_match_update_password_flag_as_literal(
+        import_pb: PlaybookImporter,
+    ) -> None:
+        _, graph_db = import_pb(
             """
             - hosts: localhost
               tasks:
                 - user:
                     name: me
                     update_password: yes
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = HardcodedSecretRule().run(graph_db)
+        results = run_rule(HardcodedSecretRule, graph_db)
 
         assert not results
 
-    def does_not_match_update_password_flag_as_expression(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def does_not_match_update_password_flag_as_expression(
+        import_pb: PlaybookImporter,
+    ) -> None:
+        _, graph_db = import_pb(
             """
             - hosts: localhost
               vars:
@@ -175,51 +171,42 @@ def describe_hardcoded_secret_rule() -> None:
                 - user:
                     name: me
                     update_password: '{{ should_update_password }}'
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = HardcodedSecretRule().run(graph_db)
+        results = run_rule(HardcodedSecretRule, graph_db)
 
         assert not results
 
-    def does_not_match_vault_value(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def does_not_match_vault_value(import_pb: PlaybookImporter) -> None:
+        _, graph_db = import_pb(
             """
             - hosts: localhost
               tasks:
                 - user:
                     name: me
                     password: !vault test
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = HardcodedSecretRule().run(graph_db)
+        results = run_rule(HardcodedSecretRule, graph_db)
 
         assert not results
 
-    def does_not_match_variable_from_inventory(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def does_not_match_variable_from_inventory(import_pb: PlaybookImporter) -> None:
+        _, graph_db = import_pb(
             """
             - hosts: localhost
               tasks:
                 - user:
                     name: me
                     password: '{{ some_password_likely_in_inventory }}'
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = HardcodedSecretRule().run(graph_db)
+        results = run_rule(HardcodedSecretRule, graph_db)
 
         assert not results
 
-    def does_not_match_task_key_in_whitelist(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def does_not_match_task_key_in_whitelist(import_pb: PlaybookImporter) -> None:
+        _, graph_db = import_pb(
             """
             - hosts: localhost
               tasks:
@@ -227,11 +214,9 @@ def describe_hardcoded_secret_rule() -> None:
                     name: me
                     password: '{{ some_password_likely_in_inventory }}'
                     update_password: 'on_create'
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = HardcodedSecretRule().run(graph_db)
+        results = run_rule(HardcodedSecretRule, graph_db)
 
         assert not results
 
@@ -239,45 +224,24 @@ def describe_hardcoded_secret_rule() -> None:
 def describe_empty_password_rule() -> None:
     _result = partial(RuleResult, EmptyPasswordRule.name, EmptyPasswordRule.description)
 
-    def matches_literal_on_task(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
-            """
+    @pytest.mark.parametrize("password", ["''", "omit"])
+    def matches_literal_on_task(import_pb: PlaybookImporter, password: str) -> None:
+        pb_path, graph_db = import_pb(
+            f"""
             - hosts: localhost
               tasks:
                 - name: test
                   user:
                     name: me
-                    password: ''
-        """,
-            pb_path,
+                    password: {password}
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = EmptyPasswordRule().run(graph_db)
+        results = run_rule(EmptyPasswordRule, graph_db)
 
         assert results == [_result(f"{pb_path}:7:31", f"{pb_path}:4:19")]
 
-    def matches_omit_literal_on_task(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
-            """
-            - hosts: localhost
-              tasks:
-                - name: test
-                  user:
-                    name: me
-                    password: omit
-        """,
-            pb_path,
-        )
-        with temp_import_pb(pb_path) as graph_db:
-            results = EmptyPasswordRule().run(graph_db)
-
-        assert results == [_result(f"{pb_path}:7:31", f"{pb_path}:4:19")]
-
-    def matches_null_literal_on_task(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def matches_null_literal_on_task(import_pb: PlaybookImporter) -> None:
+        pb_path, graph_db = import_pb(
             """
             - hosts: localhost
               tasks:
@@ -285,17 +249,14 @@ def describe_empty_password_rule() -> None:
                   user:
                     name: me
                     password:
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = EmptyPasswordRule().run(graph_db)
+        results = run_rule(EmptyPasswordRule, graph_db)
 
         assert results == [_result(f"{pb_path}:4:19", f"{pb_path}:4:19")]
 
-    def matches_variable_on_task(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def matches_variable_on_task(import_pb: PlaybookImporter) -> None:
+        pb_path, graph_db = import_pb(
             """
             - hosts: localhost
               vars:
@@ -305,17 +266,14 @@ def describe_empty_password_rule() -> None:
                   user:
                     name: me
                     password: '{{ a_var }}'
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = EmptyPasswordRule().run(graph_db)
+        results = run_rule(EmptyPasswordRule, graph_db)
 
         assert results == [_result(f"{pb_path}:4:24", f"{pb_path}:6:19")]
 
-    def matches_2_chain_variable_on_task(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def matches_2_chain_variable_on_task(import_pb: PlaybookImporter) -> None:
+        pb_path, graph_db = import_pb(
             """
             - hosts: localhost
               vars:
@@ -326,34 +284,28 @@ def describe_empty_password_rule() -> None:
                   user:
                     name: me
                     password: '{{ another_var }}'
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = EmptyPasswordRule().run(graph_db)
+        results = run_rule(EmptyPasswordRule, graph_db)
 
         assert results == [_result(f"{pb_path}:4:24", f"{pb_path}:7:19")]
 
-    def matches_variable_name_with_literal(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def matches_variable_name_with_literal(import_pb: PlaybookImporter) -> None:
+        pb_path, graph_db = import_pb(
             """
             - hosts: localhost
               vars:
                 secret_password: ''
               tasks:
                 - debug: msg={{ secret_password }}
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = EmptyPasswordRule().run(graph_db)
+        results = run_rule(EmptyPasswordRule, graph_db)
 
         assert results == [_result(f"{pb_path}:4:34", f"{pb_path}:4:17")]
 
-    def matches_indirect_variable_name(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def matches_indirect_variable_name(import_pb: PlaybookImporter) -> None:
+        pb_path, graph_db = import_pb(
             """
             - hosts: localhost
               vars:
@@ -361,11 +313,9 @@ def describe_empty_password_rule() -> None:
                 secret_password: '{{ a_var }}'
               tasks:
                 - debug: msg={{ secret_password }}
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = EmptyPasswordRule().run(graph_db)
+        results = run_rule(EmptyPasswordRule, graph_db)
 
         assert results == [_result(f"{pb_path}:4:24", f"{pb_path}:5:17")]
 
@@ -375,25 +325,21 @@ def describe_admin_by_default_rule() -> None:
         RuleResult, AdminByDefaultRule.name, AdminByDefaultRule.description
     )
 
-    def matches_literal_on_task(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def matches_literal_on_task(import_pb: PlaybookImporter) -> None:
+        pb_path, graph_db = import_pb(
             """
             - hosts: localhost
               tasks:
                 - debug: msg=test
                   become_user: admin
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = AdminByDefaultRule().run(graph_db)
+        results = run_rule(AdminByDefaultRule, graph_db)
 
         assert results == [_result(f"{pb_path}:5:32", f"{pb_path}:4:19")]
 
-    def matches_variable_on_task(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def matches_variable_on_task(import_pb: PlaybookImporter) -> None:
+        pb_path, graph_db = import_pb(
             """
             - hosts: localhost
               vars:
@@ -401,11 +347,9 @@ def describe_admin_by_default_rule() -> None:
               tasks:
                 - debug: msg=test
                   become_user: '{{ user_name }}'
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = AdminByDefaultRule().run(graph_db)
+        results = run_rule(AdminByDefaultRule, graph_db)
 
         assert results == [_result(f"{pb_path}:4:28", f"{pb_path}:6:19")]
 
@@ -415,25 +359,21 @@ def describe_http_without_tls_or_ssl_rule() -> None:
         RuleResult, HTTPWithoutSSLTLSRule.name, HTTPWithoutSSLTLSRule.description
     )
 
-    def matches_literal_on_task(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def matches_literal_on_task(import_pb: PlaybookImporter) -> None:
+        pb_path, graph_db = import_pb(
             """
             - hosts: localhost
               tasks:
                 - get_url:
                     url: http://example.com
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = HTTPWithoutSSLTLSRule().run(graph_db)
+        results = run_rule(HTTPWithoutSSLTLSRule, graph_db)
 
         assert results == [_result(f"{pb_path}:5:26", f"{pb_path}:4:19")]
 
-    def matches_variable_on_task(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def matches_variable_on_task(import_pb: PlaybookImporter) -> None:
+        pb_path, graph_db = import_pb(
             """
             - hosts: localhost
               vars:
@@ -441,17 +381,14 @@ def describe_http_without_tls_or_ssl_rule() -> None:
               tasks:
                 - get_url:
                     url: '{{ file_url }}'
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = HTTPWithoutSSLTLSRule().run(graph_db)
+        results = run_rule(HTTPWithoutSSLTLSRule, graph_db)
 
         assert results == [_result(f"{pb_path}:4:27", f"{pb_path}:6:19")]
 
-    def matches_expression_creating_url(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def matches_expression_creating_url(import_pb: PlaybookImporter) -> None:
+        pb_path, graph_db = import_pb(
             """
             - hosts: localhost
               vars:
@@ -459,17 +396,14 @@ def describe_http_without_tls_or_ssl_rule() -> None:
               tasks:
                 - get_url:
                     url: 'http://{{ server }}/test'
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = HTTPWithoutSSLTLSRule().run(graph_db)
+        results = run_rule(HTTPWithoutSSLTLSRule, graph_db)
 
         assert results == [_result(f"{pb_path}:7:26", f"{pb_path}:6:19")]
 
-    def matches_transitive_expression_creating_url(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def matches_transitive_expression_creating_url(import_pb: PlaybookImporter) -> None:
+        pb_path, graph_db = import_pb(
             """
             - hosts: localhost
               vars:
@@ -478,65 +412,53 @@ def describe_http_without_tls_or_ssl_rule() -> None:
               tasks:
                 - get_url:
                     url: '{{ url }}'
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = HTTPWithoutSSLTLSRule().run(graph_db)
+        results = run_rule(HTTPWithoutSSLTLSRule, graph_db)
 
         assert results == [_result(f"{pb_path}:5:22", f"{pb_path}:7:19")]
 
-    def does_not_match_localhost(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def does_not_match_localhost(import_pb: PlaybookImporter) -> None:
+        _, graph_db = import_pb(
             """
             - hosts: localhost
               tasks:
                 - get_url:
                     url: http://localhost/test
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = HTTPWithoutSSLTLSRule().run(graph_db)
+        results = run_rule(HTTPWithoutSSLTLSRule, graph_db)
 
         assert not results
 
-    def does_not_match_localhost_ip(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def does_not_match_localhost_ip(import_pb: PlaybookImporter) -> None:
+        _, graph_db = import_pb(
             """
             - hosts: localhost
               tasks:
                 - get_url:
                     url: http://127.0.0.1/test
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = HTTPWithoutSSLTLSRule().run(graph_db)
+        results = run_rule(HTTPWithoutSSLTLSRule, graph_db)
 
         assert not results
 
-    def does_not_match_localhost_in_expression(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def does_not_match_localhost_in_expression(import_pb: PlaybookImporter) -> None:
+        _, graph_db = import_pb(
             """
             - hosts: localhost
               tasks:
                 - get_url:
                     url: 'http://127.0.0.1/{{ path }}'
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = HTTPWithoutSSLTLSRule().run(graph_db)
+        results = run_rule(HTTPWithoutSSLTLSRule, graph_db)
 
         assert not results
 
-    def does_not_match_localhost_with_indirection(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def does_not_match_localhost_with_indirection(import_pb: PlaybookImporter) -> None:
+        _, graph_db = import_pb(
             """
             - hosts: localhost
               vars:
@@ -545,33 +467,27 @@ def describe_http_without_tls_or_ssl_rule() -> None:
               tasks:
                 - get_url:
                     url: '{{ url }}'
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = HTTPWithoutSSLTLSRule().run(graph_db)
+        results = run_rule(HTTPWithoutSSLTLSRule, graph_db)
 
         assert not results
 
-    def does_not_match_https(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def does_not_match_https(import_pb: PlaybookImporter) -> None:
+        _, graph_db = import_pb(
             """
             - hosts: localhost
               tasks:
                 - get_url:
                     url: 'https://example.com/'
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = HTTPWithoutSSLTLSRule().run(graph_db)
+        results = run_rule(HTTPWithoutSSLTLSRule, graph_db)
 
         assert not results
 
-    def matches_only_the_correct_one(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def matches_only_the_correct_one(import_pb: PlaybookImporter) -> None:
+        pb_path, graph_db = import_pb(
             """
             - hosts: localhost
               vars:
@@ -585,11 +501,9 @@ def describe_http_without_tls_or_ssl_rule() -> None:
                     url: '{{ url }}'
                   vars:
                     server: google.com
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = HTTPWithoutSSLTLSRule().run(graph_db)
+        results = run_rule(HTTPWithoutSSLTLSRule, graph_db)
 
         assert results == [_result(f"{pb_path}:4:22", f"{pb_path}:10:19")]
 
@@ -601,25 +515,21 @@ def describe_missing_integrity_check_rule() -> None:
         MissingIntegrityCheckRule.description,
     )
 
-    def matches_literal_url_on_task(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def matches_literal_url_on_task(import_pb: PlaybookImporter) -> None:
+        pb_path, graph_db = import_pb(
             """
             - hosts: localhost
               tasks:
                 - get_url:
                     url: https://example.com/source.tar.gz
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = MissingIntegrityCheckRule().run(graph_db)
+        results = run_rule(MissingIntegrityCheckRule, graph_db)
 
         assert results == [_result(f"{pb_path}:5:26", f"{pb_path}:4:19")]
 
-    def matches_variable_on_task(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def matches_variable_on_task(import_pb: PlaybookImporter) -> None:
+        pb_path, graph_db = import_pb(
             """
             - hosts: localhost
               vars:
@@ -627,17 +537,14 @@ def describe_missing_integrity_check_rule() -> None:
               tasks:
                 - get_url:
                     url: '{{ file_url }}'
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = MissingIntegrityCheckRule().run(graph_db)
+        results = run_rule(MissingIntegrityCheckRule, graph_db)
 
         assert results == [_result(f"{pb_path}:4:27", f"{pb_path}:6:19")]
 
-    def matches_expression_creating_url(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def matches_expression_creating_url(import_pb: PlaybookImporter) -> None:
+        pb_path, graph_db = import_pb(
             """
             - hosts: localhost
               vars:
@@ -645,51 +552,34 @@ def describe_missing_integrity_check_rule() -> None:
               tasks:
                 - get_url:
                     url: 'https://{{ server }}/source.tar.gz'
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = MissingIntegrityCheckRule().run(graph_db)
+        results = run_rule(MissingIntegrityCheckRule, graph_db)
 
         assert results == [_result(f"{pb_path}:7:26", f"{pb_path}:6:19")]
 
-    def matches_disabled_gpgcheck(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
-            """
-            - hosts: localhost
-              tasks:
-                - apt:
-                    name: test
-                    gpgcheck: no
-        """,
-            pb_path,
-        )
-        with temp_import_pb(pb_path) as graph_db:
-            results = MissingIntegrityCheckRule().run(graph_db)
-
-        assert results == [_result(f"{pb_path}:4:19", f"{pb_path}:4:19")]
-
-    def matches_inverted_disabled_gpgcheck(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
-            """
+    @pytest.mark.parametrize(
+        ("module", "option"),
+        [("apt", "gpgcheck: no"), ("yum", "disable_gpg_check: yes")],
+    )
+    def matches_disabled_gpgcheck(
+        import_pb: PlaybookImporter, module: str, option: str
+    ) -> None:
+        pb_path, graph_db = import_pb(
+            f"""
             - hosts: localhost
               tasks:
-                - yum:
+                - {module}:
                     name: test
-                    disable_gpg_check: yes
-        """,
-            pb_path,
+                    {option}
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = MissingIntegrityCheckRule().run(graph_db)
+        results = run_rule(MissingIntegrityCheckRule, graph_db)
 
         assert results == [_result(f"{pb_path}:4:19", f"{pb_path}:4:19")]
 
-    def matches_disabled_gpgcheck_indirectly(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def matches_disabled_gpgcheck_indirectly(import_pb: PlaybookImporter) -> None:
+        pb_path, graph_db = import_pb(
             """
             - hosts: localhost
               vars:
@@ -698,78 +588,53 @@ def describe_missing_integrity_check_rule() -> None:
                 - apt:
                     name: test
                     gpgcheck: '{{ do_gpg }}'
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = MissingIntegrityCheckRule().run(graph_db)
+        results = run_rule(MissingIntegrityCheckRule, graph_db)
 
         assert results == [_result(f"{pb_path}:4:17", f"{pb_path}:6:19")]
 
-    def does_not_match_enabled_gpgcheck(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
-            """
+    @pytest.mark.parametrize("option", ["gpgcheck: yes", "disablegpgcheck: no"])
+    def does_not_match_enabled_gpgcheck(
+        import_pb: PlaybookImporter, option: str
+    ) -> None:
+        _, graph_db = import_pb(
+            f"""
             - hosts: localhost
               tasks:
                 - apt:
                     name: test
-                    gpgcheck: yes
-        """,
-            pb_path,
+                    {option}
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = MissingIntegrityCheckRule().run(graph_db)
+        results = run_rule(MissingIntegrityCheckRule, graph_db)
 
         assert not results
 
-    def does_not_match_inverted_enabled_gpgcheck(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
-            """
-            - hosts: localhost
-              tasks:
-                - apt:
-                    name: test
-                    disablegpgcheck: no
-        """,
-            pb_path,
-        )
-        with temp_import_pb(pb_path) as graph_db:
-            results = MissingIntegrityCheckRule().run(graph_db)
-
-        assert not results
-
-    def does_not_match_url_with_checksum(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def does_not_match_url_with_checksum(import_pb: PlaybookImporter) -> None:
+        _, graph_db = import_pb(
             """
             - hosts: localhost
               tasks:
                 - get_url:
                     url: https://example.com/source.tar.gz
                     checksum: test
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = MissingIntegrityCheckRule().run(graph_db)
+        results = run_rule(MissingIntegrityCheckRule, graph_db)
 
         assert not results
 
-    def does_not_match_non_source_url(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def does_not_match_non_source_url(import_pb: PlaybookImporter) -> None:
+        _, graph_db = import_pb(
             """
             - hosts: localhost
               tasks:
                 - get_url:
                     url: 'http://127.0.0.1/test'
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = MissingIntegrityCheckRule().run(graph_db)
+        results = run_rule(MissingIntegrityCheckRule, graph_db)
 
         assert not results
 
@@ -781,25 +646,21 @@ def describe_unrestricted_ip_address_rule() -> None:
         UnrestrictedIPAddressRule.description,
     )
 
-    def matches_literal_on_task(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def matches_literal_on_task(import_pb: PlaybookImporter) -> None:
+        pb_path, graph_db = import_pb(
             """
             - hosts: localhost
               tasks:
                 - test:
                     bind: 0.0.0.0
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = UnrestrictedIPAddressRule().run(graph_db)
+        results = run_rule(UnrestrictedIPAddressRule, graph_db)
 
         assert results == [_result(f"{pb_path}:5:27", f"{pb_path}:4:19")]
 
-    def matches_indirect_literal_on_task(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def matches_indirect_literal_on_task(import_pb: PlaybookImporter) -> None:
+        pb_path, graph_db = import_pb(
             """
             - hosts: localhost
               vars:
@@ -807,17 +668,14 @@ def describe_unrestricted_ip_address_rule() -> None:
               tasks:
                 - test:
                     bind: '{{ bind_address }}'
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = UnrestrictedIPAddressRule().run(graph_db)
+        results = run_rule(UnrestrictedIPAddressRule, graph_db)
 
         assert results == [_result(f"{pb_path}:4:31", f"{pb_path}:6:19")]
 
-    def does_not_match_10_0_0_0(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def does_not_match_10_0_0_0(import_pb: PlaybookImporter) -> None:
+        _, graph_db = import_pb(
             """
             - hosts: localhost
               vars:
@@ -825,11 +683,9 @@ def describe_unrestricted_ip_address_rule() -> None:
               tasks:
                 - test:
                     bind: '{{ bind_address }}'
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = UnrestrictedIPAddressRule().run(graph_db)
+        results = run_rule(UnrestrictedIPAddressRule, graph_db)
 
         assert not results
 
@@ -839,26 +695,22 @@ def describe_weak_crypto_rule() -> None:
         RuleResult, WeakCryptoAlgorithmRule.name, WeakCryptoAlgorithmRule.description
     )
 
-    def matches_literal_on_task(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def matches_literal_on_task(import_pb: PlaybookImporter) -> None:
+        pb_path, graph_db = import_pb(
             """
             - hosts: localhost
               tasks:
                 - get_url:
                     url: https://example.com/source.tar.gz
                     checksum: 'md5:123456'
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = WeakCryptoAlgorithmRule().run(graph_db)
+        results = run_rule(WeakCryptoAlgorithmRule, graph_db)
 
         assert results == [_result(f"{pb_path}:6:31", f"{pb_path}:4:19")]
 
-    def matches_indirect_literal_on_task(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def matches_indirect_literal_on_task(import_pb: PlaybookImporter) -> None:
+        pb_path, graph_db = import_pb(
             """
             - hosts: localhost
               vars:
@@ -867,48 +719,39 @@ def describe_weak_crypto_rule() -> None:
                 - get_url:
                     url: https://example.com/source.tar.gz
                     checksum: '{{ file_checksum }}'
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = WeakCryptoAlgorithmRule().run(graph_db)
+        results = run_rule(WeakCryptoAlgorithmRule, graph_db)
 
         assert results == [_result(f"{pb_path}:4:32", f"{pb_path}:6:19")]
 
-    def matches_usage_in_expressions(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def matches_usage_in_expressions(import_pb: PlaybookImporter) -> None:
+        pb_path, graph_db = import_pb(
             """
             - hosts: localhost
               tasks:
                 - user:
                     name: me
                     password: '{{ some_pass | password_hash("md5") }}'
-        """,
-            pb_path,
+        """
         )
-        with temp_import_pb(pb_path) as graph_db:
-            results = WeakCryptoAlgorithmRule().run(graph_db)
+        results = run_rule(WeakCryptoAlgorithmRule, graph_db)
 
         assert results == [_result(f"{pb_path}:6:31", f"{pb_path}:4:19")]
 
 
 def describe_glitch_test_cases() -> None:
-    def admin_by_default(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def admin_by_default(import_pb: PlaybookImporter) -> None:
+        pb_path, graph_db = import_pb(
             """
             - hosts: localhost
               tasks:
                 - name: Install serverspec
                   become_user: root
                   command: gem install serverspec
-        """,
-            pb_path,
+        """
         )
-
-        with temp_import_pb(pb_path) as graph_db:
-            results = run_all_checks(graph_db)
+        results = run_all_checks(graph_db)
 
         assert results == [
             RuleResult(
@@ -919,10 +762,9 @@ def describe_glitch_test_cases() -> None:
             )
         ]
 
-    @pytest.mark.xfail(reason="nested key in dict literal")
-    def empty_password(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    @pytest.mark.xfail(reason="nested key in dict literal", run=False)
+    def empty_password(import_pb: PlaybookImporter) -> None:
+        pb_path, graph_db = import_pb(
             """
             - hosts: localhost
               tasks:
@@ -939,12 +781,9 @@ def describe_glitch_test_cases() -> None:
                   until: (login_data.status == 200) and (login_data.json is defined)
                   retries: 30
                   delay: 10
-        """,
-            pb_path,
+        """
         )
-
-        with temp_import_pb(pb_path) as graph_db:
-            results = run_all_checks(graph_db)
+        results = run_all_checks(graph_db)
 
         assert results == [
             RuleResult(
@@ -955,10 +794,9 @@ def describe_glitch_test_cases() -> None:
             )
         ]
 
-    @pytest.mark.xfail(reason="nested key in dict literal")
-    def hardcoded_secret(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    @pytest.mark.xfail(reason="nested key in dict literal", run=False)
+    def hardcoded_secret(import_pb: PlaybookImporter) -> None:
+        pb_path, graph_db = import_pb(
             """
             - hosts: localhost
               tasks:
@@ -975,12 +813,9 @@ def describe_glitch_test_cases() -> None:
                   until: (login_data.status == 200) and (login_data.json is defined)
                   retries: 30
                   delay: 10
-        """,
-            pb_path,
+        """
         )
-
-        with temp_import_pb(pb_path) as graph_db:
-            results = run_all_checks(graph_db)
+        results = run_all_checks(graph_db)
 
         assert results == [
             RuleResult(
@@ -991,9 +826,8 @@ def describe_glitch_test_cases() -> None:
             )
         ]
 
-    def http_without_tls_ssl(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def http_without_tls_ssl(import_pb: PlaybookImporter) -> None:
+        pb_path, graph_db = import_pb(
             """
             - hosts: localhost
               tasks:
@@ -1011,12 +845,9 @@ def describe_glitch_test_cases() -> None:
                   retries: 30
                   delay: 10
 
-        """,
-            pb_path,
+        """
         )
-
-        with temp_import_pb(pb_path) as graph_db:
-            results = run_all_checks(graph_db)
+        results = run_all_checks(graph_db)
 
         assert results == [
             RuleResult(
@@ -1027,9 +858,8 @@ def describe_glitch_test_cases() -> None:
             )
         ]
 
-    def no_integrity_check(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def no_integrity_check(import_pb: PlaybookImporter) -> None:
+        _, graph_db = import_pb(
             """
             - hosts: localhost
               tasks:
@@ -1042,20 +872,16 @@ def describe_glitch_test_cases() -> None:
                   when: oreg_auth_user is defined
                   register: node_oreg_auth_credentials_stat
 
-        """,
-            pb_path,
+        """
         )
-
-        with temp_import_pb(pb_path) as graph_db:
-            results = run_all_checks(graph_db)
+        results = run_all_checks(graph_db)
 
         # False positive
         assert not results
 
-    @pytest.mark.xfail(reason="unsupported literal type")
-    def unrestricted_ip_address(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    @pytest.mark.xfail(reason="unsupported literal type", run=False)
+    def unrestricted_ip_address(import_pb: PlaybookImporter) -> None:
+        pb_path, graph_db = import_pb(
             """
             - hosts: localhost
               tasks:
@@ -1066,12 +892,9 @@ def describe_glitch_test_cases() -> None:
                     live_migration_flag: "VIR_MIGRATE_UNDEFINE_SOURCE,VIR_MIGRATE_PEER2PEER,VIR_MIGRATE_LIVE"
                     vncserver_listen: "0.0.0.0"
 
-        """,
-            pb_path,
+        """
         )
-
-        with temp_import_pb(pb_path) as graph_db:
-            results = run_all_checks(graph_db)
+        results = run_all_checks(graph_db)
 
         assert results == [
             RuleResult(
@@ -1082,9 +905,8 @@ def describe_glitch_test_cases() -> None:
             )
         ]
 
-    def weak_crypto(tmp_path: Path) -> None:
-        pb_path = tmp_path / "pb.yml"
-        write_pb(
+    def weak_crypto(import_pb: PlaybookImporter) -> None:
+        pb_path, graph_db = import_pb(
             """
             - hosts: localhost
               tasks:
@@ -1100,12 +922,9 @@ def describe_glitch_test_cases() -> None:
                   register: createuser_results
                   ignore_errors: true
 
-        """,
-            pb_path,
+        """
         )
-
-        with temp_import_pb(pb_path) as graph_db:
-            results = run_all_checks(graph_db)
+        results = run_all_checks(graph_db)
 
         assert results == [
             RuleResult(
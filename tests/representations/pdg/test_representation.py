@@ -324,6 +324,45 @@ def describe_add_edge() -> None:
         assert g.num_edges == 2
 
 
+def describe_add_edges() -> None:
+    def should_add_multiple_edges(g: rep.Graph) -> None:
+        t1 = rep.Task(action="file")
+        t2 = rep.Task(action="command")
+        t3 = rep.Task(action="shell")
+        g.add_nodes([t1, t2, t3])
+
+        g.add_edges([(t1, t2, rep.ORDER), (t2, t3, rep.ORDER)])
+
+        assert g.num_edges == 2
+        assert g.has_edge(t1, t2, rep.ORDER)
+        assert g.has_edge(t2, t3, rep.ORDER)
+
+    def should_not_add_duplicate_edges(g: rep.Graph) -> None:
+        t1 = rep.Task(action="file")
+        t2 = rep.Task(action="command")
+        g.add_nodes([t1, t2])
+        g.add_edge(t1, t2, rep.ORDER)
+
+        g.add_edges([(t1, t2, rep.ORDER), (t2, t1, rep.ORDER), (t2, t1, rep.ORDER)])
+
+        assert g.num_edges == 2
+
+    def should_reject_invalid_edge(g: rep.Graph) -> None:
+        t1 = rep.Task(action="file")
+        t2 = rep.Task(action="command")
+        g.add_nodes([t1, t2])
+
+        with pytest.raises(TypeError):
+            g.add_edges([(t1, t2, rep.ORDER), (t1, t2, rep.DEF)])
+
+        assert g.num_edges == 0
+
+    def should_not_add_edges_from_empty_list(g: rep.Graph) -> None:
+        g.add_edges([])
+
+        assert g.num_edges == 0
+
+
 def validated_edge() -> None:
     def should_accept_valid_edge(
         g: rep.Graph,